@@ -1,15 +1,27 @@
-import aiofiles
 import asyncio
 from copy import deepcopy
 from datetime import datetime
 from enum import Enum, StrEnum
 import logging
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX platforms; advisory locking is best-effort
+    fcntl = None
 from typing import Optional
+import orjson
 import os
 import tempfile
 import voluptuous as vol
-from ruamel.yaml import YAML, YAMLError
+import yaml
+from yaml import YAMLError
+
+try:
+    from yaml import CSafeDumper as SceneDumperBase, CSafeLoader as SceneLoader
+except ImportError:
+    from yaml import SafeDumper as SceneDumperBase, SafeLoader as SceneLoader
 
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.components.light import ColorMode, LightEntityFeature
 from homeassistant.components.cover import CoverEntityFeature
@@ -21,6 +33,14 @@ SERVICE_SCENE_GET = "scene_get"
 SERVICE_SCENE_RELOAD = "scene_reload"
 SERVICE_SCENE_UPDATE = "scene_update"
 CAPTURE_LOCK = asyncio.Lock()
+_SCENES_CACHE: Optional[list] = None
+_SCENES_CACHE_KEY: Optional[tuple] = None
+_SCENES_CACHE_TEXT: Optional[str] = None
+_SCENES_INDEX: Optional[dict] = None
+_SCENES_BY_ID: Optional[dict] = None
+_DEBOUNCE_WINDOW = 0.5  # seconds within which repeated updates of a scene coalesce
+_PENDING_TIMERS: dict = {}  # scene_id -> asyncio.TimerHandle for the deferred write
+_PENDING_SCENES: dict = {}  # scene_id -> latest captured entities snapshot
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -31,33 +51,253 @@ CONFIG_SCHEMA = vol.Schema(
     },
     extra=vol.ALLOW_EXTRA,
 )
+def _single_entity_id(value):
+    """Unwrap a validated one-element entity_id list to its single string."""
+    return value[0]
+
+_ENTITY_ID = vol.All(cv.ensure_list, vol.Length(min=1, max=1), [cv.entity_domain("scene")], _single_entity_id)
 SERVICE_SCHEMA = vol.Schema(
     {
-        vol.Required("entity_id"): vol.All(cv.ensure_list, vol.Length(min=1, max=1), [cv.entity_id])
+        vol.Required("entity_id"): _ENTITY_ID
     },
 )
 SERVICE_RELOAD_SCHEMA = vol.Schema({})
 
 _LOGGER = logging.getLogger(__name__)
 
-yaml = YAML()
-yaml.allow_unicode = True
-yaml.default_flow_style = False
+def _read_file_sync(path: str) -> bytes:
+    """Read a file in one shot; run via asyncio.to_thread to stay off the event loop.
+
+    Takes a shared advisory lock so concurrent editors of scenes.yaml see
+    consistent contents. CAPTURE_LOCK still serializes within this process.
+    """
+    with open(path, "rb") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+        return f.read()
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Atomically replace path with data; run via asyncio.to_thread to stay off the event loop.
+
+    Writes an anonymous O_TMPFILE in the target directory, fsyncs and links it
+    into place so a crash can never leave a partial scenes.yaml. Falls back to
+    the classic mkstemp + rename on platforms without O_TMPFILE.
+    """
+    dir_ = os.path.dirname(path) or "."
+    if hasattr(os, "O_TMPFILE"):
+        try:
+            fd = os.open(dir_, os.O_TMPFILE | os.O_WRONLY, 0o644)
+        except OSError:
+            fd = None
+        if fd is not None:
+            linked = path + ".new"
+            try:
+                os.write(fd, data)
+                os.fsync(fd)
+                os.link(f"/proc/self/fd/{fd}", linked)
+                os.replace(linked, path)
+                return
+            except OSError:
+                if os.path.exists(linked):
+                    os.remove(linked)
+                # fall through to the mkstemp path
+            finally:
+                os.close(fd)
+    fd, tmp_path = tempfile.mkstemp(prefix="scenes_", suffix=".tmp", dir=dir_)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+        os.close(fd)
+        fd = None
+        os.replace(tmp_path, path)
+        tmp_path = None
+    finally:
+        if fd is not None:
+            os.close(fd)
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _read_and_parse_sync(path: str) -> tuple:
+    """Read and parse scenes.yaml in a single thread dispatch.
+
+    Returns (text, parsed) so callers keep the raw document for splicing.
+    Parsing large files here keeps the event loop free of millisecond-scale
+    YAML work.
+    """
+    content = _read_file_sync(path).decode("utf-8")
+    return content, (yaml.load(content, Loader=SceneLoader) or [])
+
+def _emit_and_write_sync(path: str, scenes_config: list, source_text: Optional[str], scene_index: Optional[int]) -> None:
+    """Emit the updated document and atomically persist it in one thread dispatch.
+
+    Prefers the single-scene splice when the source text layout allows it,
+    then the orjson/YAML full emit.
+    """
+    yaml_content = None
+    if source_text is not None and scene_index is not None:
+        yaml_content = _splice_scene(source_text, scene_index, len(scenes_config), _emit_single_scene(scenes_config[scene_index]))
+    if yaml_content is None:
+        yaml_content = _emit_scenes(scenes_config)
+    _atomic_write(path, yaml_content.encode("utf-8"))
+
+def _acquire_scenes_lock(path: str) -> Optional[int]:
+    """Take an exclusive advisory lock for a scenes.yaml read-modify-write.
+
+    Locks a stable sidecar file (path + '.lock') so cooperating writers in
+    other processes cannot interleave their own read-modify-write between our
+    read and replace; a lock on the temp file itself would be invisible to
+    them. May block, so call via asyncio.to_thread. Returns the lock fd, or
+    None when fcntl is unavailable.
+    """
+    if fcntl is None:
+        return None
+    fd = os.open(path + ".lock", os.O_CREAT | os.O_RDWR, 0o644)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd
+
+def _release_scenes_lock(fd: Optional[int]) -> None:
+    """Release the advisory lock taken by _acquire_scenes_lock."""
+    if fd is not None:
+        os.close(fd)
+
+async def _load_scenes_config(scenes_file: str) -> list:
+    """Read and parse scenes.yaml, reusing the cached parse when the file is unchanged.
+
+    Must be called while holding CAPTURE_LOCK. The cache is keyed on the file's
+    (st_mtime_ns, st_size) so an external edit forces a reparse.
+    """
+    global _SCENES_CACHE, _SCENES_CACHE_KEY, _SCENES_CACHE_TEXT, _SCENES_INDEX, _SCENES_BY_ID
+    st = await asyncio.to_thread(os.stat, scenes_file)
+    key = (st.st_mtime_ns, st.st_size)
+    if _SCENES_CACHE is not None and key == _SCENES_CACHE_KEY:
+        return _SCENES_CACHE
+    content, scenes_config = await asyncio.to_thread(_read_and_parse_sync, scenes_file)
+    if isinstance(scenes_config, list):
+        _SCENES_CACHE = scenes_config
+        _SCENES_CACHE_KEY = key
+        _SCENES_CACHE_TEXT = content
+        _SCENES_INDEX = {}
+        _SCENES_BY_ID = {}
+        for i, scene in enumerate(scenes_config):
+            if isinstance(scene, dict) and "id" in scene:
+                _SCENES_INDEX[scene["id"]] = i
+                _SCENES_BY_ID[scene["id"]] = scene
+    else:
+        _invalidate_scenes_cache()
+    return scenes_config
+
+def _invalidate_scenes_cache() -> None:
+    """Drop the cached parse; call after writing scenes.yaml."""
+    global _SCENES_CACHE, _SCENES_CACHE_KEY, _SCENES_CACHE_TEXT, _SCENES_INDEX, _SCENES_BY_ID
+    _SCENES_CACHE = None
+    _SCENES_CACHE_KEY = None
+    _SCENES_CACHE_TEXT = None
+    _SCENES_INDEX = None
+    _SCENES_BY_ID = None
+
+def _emit_scenes(scenes_config: list) -> str:
+    """Emit the full scenes list, preferring orjson's JSON output.
+
+    After capture the scenes list holds only plain dicts/lists/scalars, and
+    JSON is a subset of YAML, so orjson can emit it an order of magnitude
+    faster than the YAML dumper. Anything orjson cannot encode falls back to
+    the SceneDumper emit with its custom representers.
+    """
+    try:
+        return orjson.dumps(scenes_config, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE).decode("utf-8")
+    except (orjson.JSONEncodeError, TypeError):
+        return yaml.dump(scenes_config, Dumper=SceneDumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+def _emit_single_scene(scene: dict) -> str:
+    """Dump one scene as a top-level YAML list-item block."""
+    block = yaml.dump([scene], Dumper=SceneDumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    return block if block.endswith("\n") else block + "\n"
+
+def _splice_scene(content: str, scene_index: int, scene_count: int, scene_block: str) -> Optional[str]:
+    """Replace one top-level list item of a scenes.yaml document with scene_block.
+
+    Top-level items are located by scanning for lines starting with '- ' at
+    column 0. Returns None when the layout cannot be matched (e.g. the number
+    of markers disagrees with the parsed scene count), in which case the
+    caller should fall back to a full dump.
+    """
+    offsets = []
+    if content.startswith("- "):
+        offsets.append(0)
+    idx = content.find("\n- ")
+    while idx != -1:
+        offsets.append(idx + 1)
+        idx = content.find("\n- ", idx + 1)
+    if len(offsets) != scene_count or scene_index >= len(offsets):
+        return None
+    start = offsets[scene_index]
+    end = offsets[scene_index + 1] if scene_index + 1 < len(offsets) else len(content)
+    return content[:start] + scene_block + content[end:]
+
+class SceneDumper(SceneDumperBase):
+    """SafeDumper (libyaml-backed when available) with representers for the HA types found in state attributes."""
+
+_PLAIN_SCALARS = frozenset((str, int, float, bool))
 
 def safe_item(item):
-    """Recursively process an item, excluding it if serialization fails."""
+    """Recursively process an item, excluding it if serialization fails.
+
+    Returns the input unchanged whenever no descendant needed conversion, so
+    already-serializable attribute trees pass through without reallocation.
+    """
     try:
+        t = type(item)
+        if t in _PLAIN_SCALARS or item is None:
+            return item
+        if t is dict:
+            changed = False
+            converted = {}
+            for k, v in item.items():
+                new_v = safe_item(v)
+                if new_v is not v or type(k) is not str:
+                    changed = True
+                converted[str(k)] = new_v
+            return converted if changed else item
+        if t is list:
+            converted = [safe_item(sub) for sub in item]
+            if all(new is old for new, old in zip(converted, item)):
+                return item
+            return converted
         if isinstance(item, Enum):
-            return item.value
-        elif isinstance(item, (list, tuple, set)):
-            return [safe_item(sub) for sub in item]
-        elif isinstance(item, dict):
+            value = item.value
+            return value if type(value) in _PLAIN_SCALARS else str(value)
+        if isinstance(item, dict):
+            # dict subclass (e.g. ReadOnlyDict): always rebuild as a plain dict
             return {str(k): safe_item(v) for k, v in item.items()}
+        if isinstance(item, (list, tuple, set)):
+            return [safe_item(sub) for sub in item]
         return item
     except Exception as e:
         _LOGGER.warning(f"Failed to serialize item {item}: {str(e)}. Excluding from output.")
         return None  # Will be filtered out later
 
+def _json_default(obj):
+    """orjson fallback for attribute values it cannot encode natively."""
+    if isinstance(obj, Enum):
+        value = obj.value
+        return value if type(value) in _PLAIN_SCALARS else str(value)
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    return str(obj)
+
+def _serialize_attributes(attributes: dict) -> dict:
+    """Convert a state-attributes mapping to plain JSON-safe scalars.
+
+    A single orjson serialize/deserialize pass does the whole conversion at
+    C level; if orjson still cannot encode the data, fall back to the
+    recursive safe_item walk. None-valued attributes are dropped either way.
+    """
+    try:
+        converted = orjson.loads(orjson.dumps(attributes, default=_json_default, option=orjson.OPT_NON_STR_KEYS))
+    except (orjson.JSONEncodeError, TypeError):
+        converted = {k: safe_item(v) for k, v in attributes.items()}
+    return {k: v for k, v in converted.items() if v is not None}
+
 def datetime_representer(dumper, data):
     return dumper.represent_scalar('tag:yaml.org,2002:timestamp', data.isoformat())
 
@@ -89,18 +329,18 @@ def set_representer(dumper, data):
     filtered = [x for x in processed if x is not None]
     return dumper.represent_sequence('tag:yaml.org,2002:seq', filtered)
 
-yaml.representer.add_representer(datetime, datetime_representer)
-yaml.representer.add_representer(Enum, enum_representer)
-yaml.representer.add_representer(StrEnum, enum_representer)
-yaml.representer.add_representer(ColorMode, colormode_representer)
-yaml.representer.add_representer(CoverEntityFeature, entityfeature_representer)
-yaml.representer.add_representer(FanEntityFeature, entityfeature_representer)
-yaml.representer.add_representer(LightEntityFeature, entityfeature_representer)
-yaml.representer.add_representer(list, list_representer)
-yaml.representer.add_representer(type(None), none_representer)
-yaml.representer.add_representer(set, set_representer)
-
-yaml.representer.add_multi_representer(
+SceneDumper.add_representer(datetime, datetime_representer)
+SceneDumper.add_representer(Enum, enum_representer)
+SceneDumper.add_representer(StrEnum, enum_representer)
+SceneDumper.add_representer(ColorMode, colormode_representer)
+SceneDumper.add_representer(CoverEntityFeature, entityfeature_representer)
+SceneDumper.add_representer(FanEntityFeature, entityfeature_representer)
+SceneDumper.add_representer(LightEntityFeature, entityfeature_representer)
+SceneDumper.add_representer(list, list_representer)
+SceneDumper.add_representer(type(None), none_representer)
+SceneDumper.add_representer(set, set_representer)
+
+SceneDumper.add_multi_representer(
     object,
     lambda dumper, data: dumper.represent_int(int(data)) if str(type(data)).startswith("<class 'zigpy.types.basic.uint8_t'>")
     else dumper.represent_scalar('tag:yaml.org,2002:str', str(data.value)) if isinstance(data, Enum)
@@ -108,15 +348,49 @@ yaml.representer.add_multi_representer(
     if hasattr(data, '__dict__') else dumper.represent_str(str(data))
 )
 
-async def retrieve_scene_id(hass: HomeAssistant, entity_id: str) -> Optional[str]:
-    if not isinstance(entity_id, str):
-        _LOGGER.error(f"SmartQasa: Invalid entity_id type, expected string but got {type(entity_id)}")
-        return None
-    
-    if not entity_id.startswith("scene."):
-        _LOGGER.error(f"SmartQasa: Invalid entity_id {entity_id}, must start with 'scene.'")
-        return None
+async def _flush_scene_update(hass: HomeAssistant, scenes_file: str, scene_id: str, reload: bool = True) -> None:
+    """Persist the latest captured snapshot for a scene (debounced write).
+
+    After a successful persist the scene platform is reloaded so the capture
+    becomes live; pass reload=False when the caller handles the reload itself.
+    """
+    persisted = False
+    async with CAPTURE_LOCK:
+        # Cancel the armed timer as well: a re-armed handle would otherwise
+        # fire a useless extra flush after this early write.
+        timer = _PENDING_TIMERS.pop(scene_id, None)
+        if timer:
+            timer.cancel()
+        scene_entities = _PENDING_SCENES.pop(scene_id, None)
+        if scene_entities is None:
+            return
+        lock_fd = await asyncio.to_thread(_acquire_scenes_lock, scenes_file)
+        try:
+            scenes_config = deepcopy(await _load_scenes_config(scenes_file))
+            if not isinstance(scenes_config, list):
+                _LOGGER.error("SmartQasa: scenes.yaml does not contain a list of scenes, dropping pending update")
+                return
+            scene_index = _SCENES_INDEX.get(scene_id) if _SCENES_INDEX is not None else None
+            if scene_index is None:
+                _LOGGER.error(f"SmartQasa: Scene ID {scene_id} no longer in scenes.yaml, dropping pending update")
+                return
+            source_text = _SCENES_CACHE_TEXT
+            scenes_config[scene_index]["entities"] = scene_entities
+            await asyncio.to_thread(_emit_and_write_sync, scenes_file, scenes_config, source_text, scene_index)
+            _invalidate_scenes_cache()
+            persisted = True
+            _LOGGER.debug(f"SmartQasa: Persisted debounced update for scene {scene_id}")
+        except YAMLError as e:
+            _LOGGER.error(f"SmartQasa: YAML serialization failed - {e}")
+        except Exception as e:
+            _LOGGER.error(f"SmartQasa: Failed to update scenes.yaml: {str(e)}")
+        finally:
+            _release_scenes_lock(lock_fd)
+    if persisted and reload:
+        await hass.services.async_call("scene", "reload")
 
+async def retrieve_scene_id(hass: HomeAssistant, entity_id: str) -> Optional[str]:
+    # entity_id is schema-validated as a scene-domain entity before we get here
     state = hass.states.get(entity_id)
     if not state or "id" not in state.attributes:
         _LOGGER.error(f"SmartQasa: No 'id' found in attributes for entity_id {entity_id}")
@@ -131,7 +405,7 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         return False
 
     async def handle_scene_get(call: ServiceCall) -> dict:
-        entity_id = call.data["entity_id"][0]
+        entity_id = call.data["entity_id"]
         scene_id = await retrieve_scene_id(hass, entity_id)
         if not scene_id:
             _LOGGER.error(f"SmartQasa: Failed to retrieve scene_id for entity {entity_id}")
@@ -140,22 +414,20 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         scenes_file = os.path.join(hass.config.config_dir, "scenes.yaml")
         async with CAPTURE_LOCK:
             try:
-                async with aiofiles.open(scenes_file, "r", encoding="utf-8") as f:
-                    content = await f.read()
-                    scenes_config = yaml.load(content) or []
-                    if not isinstance(scenes_config, list):
-                        return {"error": "scenes.yaml does not contain a list of scenes"}
-                    
-                    scene_config = next((scene for scene in scenes_config if scene.get("id") == scene_id), None)
-                    if not scene_config:
-                        return {"error": f"Scene ID {scene_id} not found in scenes.yaml"}
-                    
-                    entities = list(scene_config.get("entities", {}).keys())
-                    if not entities:
-                        _LOGGER.warning(f"SmartQasa: No entities found in scene {scene_id} for entity {entity_id}")
-                        return {"warning": f"No entities found in scene {entity_id}"}
-                    
-                    return {"entities": entities}
+                scenes_config = await _load_scenes_config(scenes_file)
+                if not isinstance(scenes_config, list):
+                    return {"error": "scenes.yaml does not contain a list of scenes"}
+
+                scene_config = _SCENES_BY_ID.get(scene_id) if _SCENES_BY_ID is not None else None
+                if not scene_config:
+                    return {"error": f"Scene ID {scene_id} not found in scenes.yaml"}
+
+                entities = list(scene_config.get("entities", {}).keys())
+                if not entities:
+                    _LOGGER.warning(f"SmartQasa: No entities found in scene {scene_id} for entity {entity_id}")
+                    return {"warning": f"No entities found in scene {entity_id}"}
+
+                return {"entities": entities}
             except FileNotFoundError:
                 _LOGGER.warning("SmartQasa: scenes.yaml not found, returning empty scene list")
                 return {"error": "scenes.yaml not found"}
@@ -164,7 +436,7 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
                 return {"error": f"Failed to load scenes.yaml: {str(e)}"}
 
     async def handle_scene_update(call: ServiceCall) -> dict:
-        entity_id = call.data["entity_id"][0]
+        entity_id = call.data["entity_id"]
         scene_id = await retrieve_scene_id(hass, entity_id)
         if not scene_id:
             _LOGGER.error(f"SmartQasa: Scene not found for entity {entity_id}")
@@ -173,15 +445,14 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
         scenes_file = os.path.join(hass.config.config_dir, "scenes.yaml")
         async with CAPTURE_LOCK:
             try:
-                async with aiofiles.open(scenes_file, "r", encoding="utf-8") as f:
-                    content = await f.read()
-                    scenes_config = yaml.load(content) or []
-                    if not isinstance(scenes_config, list):
-                        return {"success": False, "message": "scenes.yaml does not contain a list of scenes"}
-                    
-                    scene_config = next((scene for scene in scenes_config if scene.get("id") == scene_id), None)
-                    if not scene_config:
-                        return {"success": False, "message": f"Scene ID {scene_id} not found"}
+                scenes_config = await _load_scenes_config(scenes_file)
+                if not isinstance(scenes_config, list):
+                    return {"success": False, "message": "scenes.yaml does not contain a list of scenes"}
+
+                scene_index = _SCENES_INDEX.get(scene_id) if _SCENES_INDEX is not None else None
+                scene_config = scenes_config[scene_index] if scene_index is not None else None
+                if not scene_config:
+                    return {"success": False, "message": f"Scene ID {scene_id} not found"}
             except FileNotFoundError:
                 _LOGGER.warning("SmartQasa: scenes.yaml not found, returning empty scene list")
                 return {"success": False, "message": "scenes.yaml not found"}
@@ -189,48 +460,54 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
                 _LOGGER.error(f"SmartQasa: Failed to load scenes.yaml: {str(e)}")
                 return {"success": False, "message": f"Failed to load scenes.yaml: {str(e)}"}
 
-            scene_entities = scene_config.get("entities", {}).copy()
+            # Capture into a private snapshot; the cached config stays pristine.
+            # Captured attributes replace entity values wholesale, so a shallow
+            # copy is enough.
+            scene_entities = dict(scene_config.get("entities") or {})
             for entidade in scene_entities:
-                max_attempts = 3
-                state = None
-                for attempt in range(max_attempts):
-                    state = await hass.async_add_executor_job(hass.states.get, entidade)
-                    if state and state.state is not None:
-                        break
-                    delay = 0.2 * (2 ** attempt)
-                    if attempt == max_attempts - 1:
-                        _LOGGER.warning(f"SmartQasa: Entity {entidade} did not load after {max_attempts} attempts, retaining existing data.")
-                        break
-                    _LOGGER.warning(f"SmartQasa: Entity {entidade} not available, retrying ({attempt + 1}/{max_attempts}) in {delay:.1f}s...")
-                    await asyncio.sleep(delay)
-
-                if state:
-                    attributes = dict(state.attributes) if isinstance(state.attributes, dict) else {}
-                    attributes["state"] = str(state.state)
-                    # Filter out None values from attributes after safe_item processing
-                    attributes = {k: v for k, v in ((k, safe_item(v)) for k, v in attributes.items()) if v is not None}
-                    scene_entities[entidade] = attributes
-
-            scene_config["entities"] = scene_entities
-
-            temp_file = None
-            try:
-                with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', prefix='scenes_', suffix='.tmp', dir=hass.config.config_dir, delete=False) as temp_f:
-                    temp_file = temp_f.name
-                    yaml.dump(scenes_config, temp_f)
-                os.replace(temp_file, scenes_file)
-                return {"success": True, "message": f"Scene {entity_id} ({scene_id}) updated successfully"}
-            except YAMLError as e:
-                _LOGGER.error(f"SmartQasa: YAML serialization failed - {e}")
-                return {"success": False, "message": f"YAML serialization failed: {str(e)}"}
-            except Exception as e:
-                _LOGGER.error(f"SmartQasa: Failed to update scenes.yaml: {str(e)}")
-                return {"success": False, "message": f"Failed to update scenes.yaml: {str(e)}"}
-            finally:
-                if temp_file and os.path.exists(temp_file):
-                    os.remove(temp_file)
+                state = hass.states.get(entidade)
+                if not state or state.state is None:
+                    _LOGGER.debug(f"SmartQasa: Entity {entidade} not available, retaining existing data.")
+                    continue
+                attributes = dict(state.attributes) if isinstance(state.attributes, dict) else {}
+                attributes["state"] = str(state.state)
+                scene_entities[entidade] = _serialize_attributes(attributes)
+
+            baseline = _PENDING_SCENES.get(scene_id, scene_config.get("entities") or {})
+            if scene_entities == baseline:
+                _LOGGER.debug(f"SmartQasa: Scene {scene_id} unchanged, skipping persist")
+                return {"success": True, "message": f"Scene {entity_id} ({scene_id}) already up to date"}
+
+            # Coalesce rapid consecutive updates of the same scene: keep only the
+            # latest snapshot and (re)arm a short timer for the actual write.
+            _PENDING_SCENES[scene_id] = scene_entities
+            timer = _PENDING_TIMERS.pop(scene_id, None)
+            if timer:
+                timer.cancel()
+            _PENDING_TIMERS[scene_id] = asyncio.get_running_loop().call_later(
+                _DEBOUNCE_WINDOW,
+                lambda: hass.async_create_task(_flush_scene_update(hass, scenes_file, scene_id)),
+            )
+            return {"success": True, "message": f"Scene {entity_id} ({scene_id}) update scheduled"}
+
+    async def _flush_pending_on_stop(event) -> None:
+        """Persist any debounced snapshots before shutdown; their service calls already reported success."""
+        scenes_file = os.path.join(hass.config.config_dir, "scenes.yaml")
+        for scene_id in list(_PENDING_SCENES):
+            await _flush_scene_update(hass, scenes_file, scene_id, reload=False)
+        for timer in _PENDING_TIMERS.values():
+            timer.cancel()
+        _PENDING_TIMERS.clear()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _flush_pending_on_stop)
 
     async def handle_scene_reload(call: ServiceCall) -> None:
+        # Flush any debounced captures first so the reload picks them up,
+        # then block until the scene platform has re-read scenes.yaml —
+        # completing the reload is this service's only observable effect.
+        scenes_file = os.path.join(hass.config.config_dir, "scenes.yaml")
+        for scene_id in list(_PENDING_SCENES):
+            await _flush_scene_update(hass, scenes_file, scene_id, reload=False)
         await hass.services.async_call("scene", "reload")
         _LOGGER.debug("SmartQasa: Scene reload triggered")
 